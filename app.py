@@ -1,5 +1,7 @@
 # app.py
-from src.rag_pipeline import CrediTrustRAG
+from src.rag_pipeline import CrediTrustRAG, resolve_store_path
+from src.store_build import store_version
+from src.warm_cache import WarmAnswerCache, warm_store_in_background
 import sys
 from pathlib import Path
 import streamlit as st
@@ -35,6 +37,10 @@ if "rag" not in st.session_state:
 
 
 def initialize_rag():
+    rag = st.session_state.rag
+    # Reopen when the store was rebuilt since this session loaded it
+    if rag is not None and rag.store_version != store_version(resolve_store_path()):
+        st.session_state.rag = None
     if st.session_state.rag is None:
         with st.status("Initializing RAG system (this may take 5-15 minutes on first use)...") as status:
             st.write("Loading full vector store (1.37M chunks)...")
@@ -44,6 +50,21 @@ def initialize_rag():
     return st.session_state.rag
 
 
+def cached_answer(question):
+    """Precomputed answer for the current store, looked up without loading the store or models."""
+    cache = WarmAnswerCache.load(resolve_store_path())
+    return cache.get(question) if cache.is_fresh() else None
+
+
+def refresh_warm_cache(rag):
+    """Re-warm in the background (one job per process, shared by all sessions) if the store changed.
+
+    The cache is tagged with rag.store_version, the build this instance actually loaded.
+    """
+    if not WarmAnswerCache.load(rag.store_path).is_fresh():
+        warm_store_in_background(rag.store_path, rag=rag)
+
+
 # Display chat history
 for message in st.session_state.messages:
     with st.chat_message(message["role"]):
@@ -60,8 +81,13 @@ if prompt := st.chat_input("Your question (e.g., Why are customers unhappy with
     with st.chat_message("assistant"):
         with st.spinner("Processing... (first question may take several minutes)"):
             try:
-                rag_system = initialize_rag()
-                answer, sources = rag_system.ask(prompt)
+                cached = cached_answer(prompt)
+                if cached:
+                    answer, sources = cached
+                else:
+                    rag_system = initialize_rag()
+                    refresh_warm_cache(rag_system)
+                    answer, sources = rag_system.ask(prompt)
 
                 # Format answer
                 formatted_answer = ""
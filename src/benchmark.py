@@ -0,0 +1,125 @@
+# src/benchmark.py
+import argparse
+import math
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from chromadb.api.shared_system_client import SharedSystemClient
+
+from .synthetic_data import fake_embeddings, index_batches, iter_synthetic_chunks
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+BENCHMARK_QUESTIONS = [
+    "Why are customers unhappy with Credit Cards?",
+    "What are the most common issues in Money Transfers?",
+    "What fraud-related problems are reported in Savings Accounts?",
+    "Why do customers complain about unauthorized charges?",
+    "Are there delays in Money Transfers?",
+    "What fees are customers complaining about across products?",
+]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile; good enough for latency reporting."""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def benchmark_store(n_chunks: int, persist_dir: Path, top_k: int = 5, n_queries: int = 200,
+                    batch_size: int = 5000, seed: int = 42, shard_by: str | None = None) -> dict:
+    """Build a synthetic store of n_chunks at persist_dir and time ingest and queries.
+
+    The corpus is generated before the timer starts, so ingest rows/sec measures
+    embedding + indexing only. rss_delta_mb is the peak RSS growth from that point.
+    """
+    batches = list(iter_synthetic_chunks(n_chunks, seed=seed, batch_size=batch_size))
+    baseline_rss = peak_rss_mb()
+
+    start = time.perf_counter()
+    db = index_batches(persist_dir, batches, embeddings=fake_embeddings(), shard_by=shard_by)
+    ingest_seconds = time.perf_counter() - start
+    del batches
+
+    retriever = db.as_retriever(search_kwargs={"k": top_k})
+    latencies_ms = []
+    for i in range(n_queries):
+        question = BENCHMARK_QUESTIONS[i % len(BENCHMARK_QUESTIONS)]
+        start = time.perf_counter()
+        retriever.invoke(question)
+        latencies_ms.append((time.perf_counter() - start) * 1000)
+
+    chunks = db.count() if shard_by else db._collection.count()
+    peak_rss = peak_rss_mb()
+
+    return {
+        "chunks": chunks,
+        "ingest_seconds": ingest_seconds,
+        "ingest_rows_per_sec": n_chunks / ingest_seconds if ingest_seconds else 0.0,
+        "query_p50_ms": percentile(latencies_ms, 50),
+        "query_p99_ms": percentile(latencies_ms, 99),
+        "peak_rss_mb": peak_rss,
+        "rss_delta_mb": peak_rss - baseline_rss,
+    }
+
+
+def _benchmark_in_tempdir(n_chunks: int, kwargs: dict) -> dict:
+    """Subprocess entry point for run_benchmarks."""
+    try:
+        with tempfile.TemporaryDirectory(prefix="creditrust_bench_") as tmp:
+            return benchmark_store(n_chunks, Path(tmp), **kwargs)
+    finally:
+        # Chroma keeps every opened client alive for the whole process
+        SharedSystemClient.clear_system_cache()
+
+
+def run_benchmarks(sizes: list[int] = DEFAULT_SIZES, **kwargs) -> list[dict]:
+    """Benchmark each store size in a fresh subprocess, so memory figures are per size."""
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for n_chunks in sorted(sizes):
+        print(f"Benchmarking synthetic store with {n_chunks:,} chunks...")
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            result = pool.submit(_benchmark_in_tempdir, n_chunks, kwargs).result()
+        print(f"  ingest {result['ingest_rows_per_sec']:,.0f} rows/s | "
+              f"p50 {result['query_p50_ms']:.1f} ms | p99 {result['query_p99_ms']:.1f} ms | "
+              f"peak RSS {result['peak_rss_mb']:,.0f} MB (+{result['rss_delta_mb']:,.0f} MB)")
+        results.append(result)
+    return results
+
+
+def format_results(results: list[dict]) -> str:
+    table = "| Chunks | Ingest (rows/s) | Query p50 (ms) | Query p99 (ms) | Peak RSS (MB) | RSS increase (MB) |\n"
+    table += "|--------|-----------------|----------------|----------------|---------------|-------------------|\n"
+    for r in results:
+        table += (f"| {r['chunks']:,} | {r['ingest_rows_per_sec']:,.0f} | {r['query_p50_ms']:.1f} "
+                  f"| {r['query_p99_ms']:.1f} | {r['peak_rss_mb']:,.0f} | {r['rss_delta_mb']:,.0f} |\n")
+    return table
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Offline ingest/query benchmark on synthetic complaint stores")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--shard-by", choices=["product_category", "year"], default=None)
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.sizes, top_k=args.top_k, n_queries=args.queries,
+                             shard_by=args.shard_by)
+    print("\nBenchmark Results (Markdown):\n")
+    print(format_results(results))
@@ -38,4 +38,19 @@ PRODUCT_MAPPING = {
     "Consumer Loan": "Personal Loans",
     "Checking or savings account": "Savings Accounts",
     "Money transfer, virtual currency, or money service": "Money Transfers"
-}
\ No newline at end of file
+}
+
+# Warm answer cache (see src/warm_cache.py) — persisted inside each vector store directory
+WARM_CACHE_FILENAME = "warm_cache.json"
+# Written by the store builders; the warm cache is valid only for the build it was made from
+BUILD_ID_FILENAME = "build_id"
+
+# Canonical per-category questions precomputed after each store build
+CANONICAL_QUESTION_TEMPLATES = [
+    "Why are customers unhappy with {category}?",
+    "What are the most common issues in {category}?",
+    "What fees are customers complaining about in {category}?",
+]
+
+# Sharded stores keep one Chroma store per shard plus this manifest (see src/sharding.py)
+SHARD_MANIFEST_FILENAME = "shards.json"
@@ -5,9 +5,17 @@ from langchain_chroma import Chroma
 from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_core.documents import Document
 from pathlib import Path
-from config import PREBUILT_PARQUET, VECTOR_STORE_DIR
+from .config import PREBUILT_PARQUET, VECTOR_STORE_DIR, SHARD_MANIFEST_FILENAME
+from .sharding import ShardedStoreWriter
+from .store_build import mark_store_built
+from .warm_cache import warm_up_after_build
 
-def load_parquet_to_chroma(batch_size=5000):  # Small enough for your file
+def load_parquet_to_chroma(batch_size=5000, warm_up=True, shard_by=None, only_shards=None):  # Small enough for your file
+    """Index the pre-built parquet into Chroma.
+
+    shard_by="product_category" (or "year") writes one store per shard under
+    full_prebuilt/; only_shards rebuilds just those shards and keeps the rest.
+    """
     if not PREBUILT_PARQUET.exists():
         print(f"ERROR: File not found: {PREBUILT_PARQUET}")
         return False
@@ -19,18 +27,22 @@ def load_parquet_to_chroma(batch_size=5000):  # Small enough for your file
     db_path = VECTOR_STORE_DIR / "full_prebuilt"
     db_path.mkdir(parents=True, exist_ok=True)
 
-    # Start fresh
-    db = Chroma(
-        persist_directory=str(db_path),
-        embedding_function=embeddings,
-        collection_name="complaint_chunks"
-    )
-    db.delete_collection()  # Clear old data
-    db = Chroma(
-        persist_directory=str(db_path),
-        embedding_function=embeddings,
-        collection_name="complaint_chunks"
-    )
+    if shard_by:
+        writer = ShardedStoreWriter(db_path, embeddings, shard_by=shard_by, only_shards=only_shards)
+    else:
+        # Start fresh (and drop any manifest left by a previous sharded build)
+        (db_path / SHARD_MANIFEST_FILENAME).unlink(missing_ok=True)
+        db = Chroma(
+            persist_directory=str(db_path),
+            embedding_function=embeddings,
+            collection_name="complaint_chunks"
+        )
+        db.delete_collection()  # Clear old data
+        db = Chroma(
+            persist_directory=str(db_path),
+            embedding_function=embeddings,
+            collection_name="complaint_chunks"
+        )
 
     total = 0
     try:
@@ -61,17 +73,28 @@ def load_parquet_to_chroma(batch_size=5000):  # Small enough for your file
                 doc = Document(page_content=str(text), metadata=metadata)
                 docs.append(doc)
 
-            db.add_documents(docs)
-            total += len(docs)
+            if shard_by:
+                total += writer.add_documents(docs)
+            else:
+                db.add_documents(docs)
+                total += len(docs)
             print(f"Indexed {total:,} chunks so far")
 
+        if shard_by:
+            manifest = writer.close()
+            print(f"Shards ({shard_by}): {', '.join(manifest['shards'])}")
+        else:
+            mark_store_built(db_path)
         print(f"\nSUCCESS! Full vector store created with {total:,} chunks")
         print(f"Location: {db_path}")
-        return True
 
     except Exception as e:
         print(f"Error: {e}")
         return False
 
+    if warm_up:
+        warm_up_after_build(db_path)
+    return True
+
 if __name__ == "__main__":
     load_parquet_to_chroma(batch_size=5000)  # Safe for your file's row groups
\ No newline at end of file
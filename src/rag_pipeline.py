@@ -4,47 +4,84 @@ from langchain_huggingface import HuggingFaceEmbeddings  # Updated import
 from langchain_ollama import ChatOllama  # Local Ollama integration
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough
 from pathlib import Path
 # from config import VECTOR_STORE_DIR
 from src.config import VECTOR_STORE_DIR
+from src.sharding import ShardedVectorStore, is_sharded
+from src.store_build import store_version
 import textwrap  # <-- This was missing — now added!
 
+# Standard evaluation set — also precomputed by the warm cache (src/warm_cache.py)
+EVALUATION_QUESTIONS = [
+    "Why are customers unhappy with Credit Cards?",
+    "What are the most common issues in Money Transfers?",
+    "How do complaints about Personal Loans compare to Savings Accounts?",
+    "What fraud-related problems are reported in Savings Accounts?",
+    "Why do customers complain about unauthorized charges?",
+    "What billing disputes are most frequent in Credit Cards?",
+    "Are there delays in Money Transfers?",
+    "What fees are customers complaining about across products?"
+]
+
+
+def resolve_store_path(store_path: Path | None = None) -> Path:
+    """Explicit store path, else the full pre-built store, else the Task 2 sample store.
+
+    Cheap (no model or index loading), so the UI can use it to look up the warm cache first.
+    """
+    full_store = VECTOR_STORE_DIR / "full_prebuilt"
+    sample_store = VECTOR_STORE_DIR / "sample_chroma"
+
+    if store_path is not None:
+        store_path = Path(store_path)
+        if not store_path.exists():
+            raise FileNotFoundError(
+                f"Vector store not found: {store_path}")
+        return store_path
+    if full_store.exists():
+        return full_store
+    if sample_store.exists():
+        print("Full store not found. Using sample store from Task 2.")
+        return sample_store
+    raise FileNotFoundError(
+        "No vector store found. Run Task 2 or load_prebuilt.py first.")
+
 
 class CrediTrustRAG:
-    def __init__(self, top_k: int = 5):
+    def __init__(self, top_k: int = 5, store_path: Path | None = None,
+                 embeddings=None, llm=None, shards: list[str] | None = None):
         # Embedding model (same as pre-built)
         self.embedding_model = "sentence-transformers/all-MiniLM-L6-v2"
-        self.embeddings = HuggingFaceEmbeddings(
+        # Tests and benchmarks inject offline fakes (see src/synthetic_data.py)
+        self.embeddings = embeddings or HuggingFaceEmbeddings(
             model_name=self.embedding_model)
         self.top_k = top_k
 
-        # Vector store path
-        full_store = VECTOR_STORE_DIR / "full_prebuilt"
-        sample_store = VECTOR_STORE_DIR / "sample_chroma"
-
-        if full_store.exists():
+        store_path = resolve_store_path(store_path)
+        if store_path.name == "full_prebuilt":
             print("Loading full pre-built vector store (~1.37M chunks)...")
-            store_path = full_store
-        elif sample_store.exists():
-            print("Full store not found. Using sample store from Task 2.")
-            store_path = sample_store
-        else:
-            raise FileNotFoundError(
-                "No vector store found. Run Task 2 or load_prebuilt.py first.")
 
-        self.db = Chroma(
-            persist_directory=str(store_path),
-            embedding_function=self.embeddings,
-            collection_name="complaint_chunks"
-        )
-        count = self.db._collection.count()
+        self.store_path = store_path
+        # Build this instance serves; read before opening so a concurrent rebuild looks newer
+        self.store_version = store_version(store_path)
+        if is_sharded(store_path):
+            # One Chroma store per shard; `shards` limits which ones are opened
+            self.db = ShardedVectorStore.load(store_path, self.embeddings, shards=shards)
+            count = self.db.count()
+            print(f"Sharded store ({self.db.shard_by}): {len(self.db.shards)} shards opened")
+        else:
+            self.db = Chroma(
+                persist_directory=str(store_path),
+                embedding_function=self.embeddings,
+                collection_name="complaint_chunks"
+            )
+            count = self.db._collection.count()
         print(f"Vector store loaded: {count:,} chunks")
 
         self.retriever = self.db.as_retriever(search_kwargs={"k": self.top_k})
 
         # Local LLM via Ollama
-        self.llm = ChatOllama(
+        self.llm = llm or ChatOllama(
             model="llama3.2",  # Change to "mistral" if you prefer
             temperature=0.3,
         )
@@ -61,24 +98,27 @@ Question: {question}
 Answer:"""
         )
 
-        def format_docs(docs):
-            return "\n\n".join(
-                f"[{i+1}] (Product: {doc.metadata.get('product_category', 'Unknown')}) {doc.page_content}"
-                for i, doc in enumerate(docs)
-            )
+        # Generation chain — ask() does its own (optionally filtered) retrieval first
+        self.chain = self.prompt | self.llm | StrOutputParser()
 
-        # RAG chain
-        self.chain = (
-            {"context": self.retriever | format_docs,
-                "question": RunnablePassthrough()}
-            | self.prompt
-            | self.llm
-            | StrOutputParser()
+    @staticmethod
+    def format_docs(docs):
+        return "\n\n".join(
+            f"[{i+1}] (Product: {doc.metadata.get('product_category', 'Unknown')}) {doc.page_content}"
+            for i, doc in enumerate(docs)
         )
 
-    def ask(self, question: str):
-        answer = self.chain.invoke(question)
-        docs = self.retriever.invoke(question)
+    def retrieve(self, question: str, product_category: str | None = None):
+        """Top-k chunks; a product_category filter goes to a single shard on sharded stores."""
+        if product_category is None:
+            return self.retriever.invoke(question)
+        return self.db.similarity_search(
+            question, k=self.top_k, filter={"product_category": product_category})
+
+    def ask(self, question: str, product_category: str | None = None):
+        docs = self.retrieve(question, product_category)
+        answer = self.chain.invoke(
+            {"context": self.format_docs(docs), "question": question})
         sources = [
             {
                 "product_category": doc.metadata.get("product_category", "Unknown"),
@@ -90,16 +130,7 @@ Answer:"""
         return answer.strip(), sources
 
     def evaluate(self):
-        questions = [
-            "Why are customers unhappy with Credit Cards?",
-            "What are the most common issues in Money Transfers?",
-            "How do complaints about Personal Loans compare to Savings Accounts?",
-            "What fraud-related problems are reported in Savings Accounts?",
-            "Why do customers complain about unauthorized charges?",
-            "What billing disputes are most frequent in Credit Cards?",
-            "Are there delays in Money Transfers?",
-            "What fees are customers complaining about across products?"
-        ]
+        questions = EVALUATION_QUESTIONS
 
         print("\n" + "="*70)
         print("TASK 3: RAG PIPELINE EVALUATION (Local Llama 3.2 via Ollama)")
@@ -109,7 +140,7 @@ Answer:"""
         table += "|---|----------|----------------|-------------|---------|----------|\n"
 
         for i, q in enumerate(questions, 1):
-            print(f"Processing question {i}/8...")
+            print(f"Processing question {i}/{len(questions)}...")
             answer, sources = self.ask(q)
             summary = textwrap.shorten(answer, width=120, placeholder="...")
             top_sources = "<br>".join([
@@ -0,0 +1,119 @@
+# src/sampling.py
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+
+def allocate(counts: dict[str, int], n: int) -> dict[str, int]:
+    """Split n across strata proportionally to counts (largest-remainder rounding)."""
+    total = sum(counts.values())
+    if total == 0:
+        return {k: 0 for k in counts}
+    if n >= total:
+        return dict(counts)
+
+    exact = {k: n * c / total for k, c in counts.items()}
+    alloc = {k: int(v) for k, v in exact.items()}
+    # Hand out the remaining rows to the largest fractional parts (ties → stratum name)
+    leftover = n - sum(alloc.values())
+    for k in sorted(exact, key=lambda k: (alloc[k] - exact[k], k))[:leftover]:
+        alloc[k] += 1
+    return alloc
+
+
+def iter_data_chunks(sources: Path | list[Path], columns: list[str] | None = None,
+                     chunksize: int = 100_000) -> Iterator[pd.DataFrame]:
+    """Stream CSV or parquet partitions as DataFrame chunks, in a stable order."""
+    paths = [Path(sources)] if isinstance(sources, (str, Path)) else [Path(p) for p in sources]
+    for path in paths:
+        if path.suffix == ".parquet":
+            import pyarrow.parquet as pq
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+                yield batch.to_pandas()
+        else:
+            yield from pd.read_csv(path, usecols=columns, chunksize=chunksize, dtype=str)
+
+
+class StratifiedReservoirSampler:
+    """Single-pass, bounded-memory stratified sampler for one or more sample sizes.
+
+    Every row gets a pseudo-random key hashed from (seed, row id). Per stratum we
+    keep only the max(sizes) rows with the smallest keys, so memory is
+    O(strata × max(sizes)) row positions no matter how large the input is. With
+    keep_rows=True the full candidate rows are kept alongside, bounded the same
+    way, so the samples come out of that one pass. Once
+    the pass is done, the stratum counts are known. Each size then takes the
+    smallest-key rows of every stratum, in proportion to the stratum counts.
+    Smaller samples are therefore (almost always) subsets of larger ones.
+    """
+
+    def __init__(self, sizes: int | list[int], strata_col: str = "product_category",
+                 id_col: str = "Complaint ID", seed: int = 42, keep_rows: bool = False):
+        self.sizes = sorted({sizes} if isinstance(sizes, int) else set(sizes))
+        self.capacity = self.sizes[-1]
+        self.strata_col = strata_col
+        self.id_col = id_col
+        self.hash_key = f"{seed:016d}"[-16:]  # hash_pandas_object needs a 16-byte key
+        self.counts: dict[str, int] = {}
+        self._keys: dict[str, np.ndarray] = {}
+        self._positions: dict[str, np.ndarray] = {}
+        self.keep_rows = keep_rows
+        self._rows: dict[str, pd.DataFrame] = {}
+        self.rows_seen = 0
+
+    def update(self, chunk: pd.DataFrame):
+        """Feed the next chunk; only the id and strata columns are used unless keep_rows."""
+        # Hash ids as strings so CSV, parquet and in-memory frames pick the same rows
+        ids = chunk[self.id_col].astype(str)
+        keys = pd.util.hash_pandas_object(ids, index=False, hash_key=self.hash_key).to_numpy()
+        positions = np.arange(self.rows_seen, self.rows_seen + len(chunk), dtype=np.int64)
+        self.rows_seen += len(chunk)
+
+        for stratum, idx in chunk.groupby(self.strata_col, sort=False).indices.items():
+            self.counts[stratum] = self.counts.get(stratum, 0) + len(idx)
+            k = np.concatenate([self._keys.get(stratum, np.empty(0, np.uint64)), keys[idx]])
+            p = np.concatenate([self._positions.get(stratum, np.empty(0, np.int64)), positions[idx]])
+            keep = np.lexsort((p, k))[:self.capacity]
+            self._keys[stratum], self._positions[stratum] = k[keep], p[keep]
+            if self.keep_rows:
+                # Same concatenation order as k/p, so `keep` indexes the rows too
+                new_rows = chunk.iloc[idx].set_index(positions[idx])
+                rows = pd.concat([self._rows[stratum], new_rows]) if stratum in self._rows else new_rows
+                self._rows[stratum] = rows.iloc[keep]
+
+    def selections(self) -> dict[int, np.ndarray]:
+        """Sorted row positions selected for each requested size."""
+        result = {}
+        for n in self.sizes:
+            alloc = allocate(self.counts, n)
+            picked = [self._positions[s][:alloc[s]] for s in sorted(alloc)]
+            result[n] = np.sort(np.concatenate(picked)) if picked else np.empty(0, np.int64)
+        return result
+
+    def samples(self) -> dict[int, pd.DataFrame]:
+        """Full sampled rows for each requested size, in input order (needs keep_rows=True)."""
+        if not self.keep_rows:
+            raise ValueError("samples() needs a sampler created with keep_rows=True")
+        result = {}
+        for n in self.sizes:
+            alloc = allocate(self.counts, n)
+            picked = [self._rows[s].iloc[:alloc[s]] for s in sorted(alloc)]
+            sample = pd.concat(picked).sort_index() if picked else pd.DataFrame()
+            result[n] = sample.reset_index(drop=True)
+        return result
+
+
+def stream_stratified_samples(sources: Path | list[Path], sizes: int | list[int],
+                              strata_col: str = "product_category", id_col: str = "Complaint ID",
+                              seed: int = 42, chunksize: int = 100_000) -> dict[int, pd.DataFrame]:
+    """Draw stratified samples of several sizes from CSV/parquet partitions in a single pass.
+
+    Only the current candidate rows (at most strata × max(sizes)) are held in memory.
+    """
+    sampler = StratifiedReservoirSampler(sizes, strata_col=strata_col, id_col=id_col,
+                                         seed=seed, keep_rows=True)
+    for chunk in iter_data_chunks(sources, chunksize=chunksize):
+        sampler.update(chunk)
+    return sampler.samples()
@@ -0,0 +1,207 @@
+# src/sharding.py
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from langchain_chroma import Chroma
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from .config import BUILD_ID_FILENAME, SHARD_MANIFEST_FILENAME
+from .store_build import new_build_id
+
+# Supported shard keys: a metadata field, or "year" derived from date_received
+SHARD_KEYS = ("product_category", "year")
+
+
+def is_sharded(store_path: Path) -> bool:
+    return (Path(store_path) / SHARD_MANIFEST_FILENAME).exists()
+
+
+def shard_value(metadata: dict, shard_by: str) -> str:
+    if shard_by == "year":
+        return str(metadata.get("date_received", ""))[:4] or "unknown"
+    return str(metadata.get(shard_by) or "Unknown")
+
+
+def shard_dirname(value: str) -> str:
+    """'Credit Cards' → 'credit_cards'"""
+    return re.sub(r"[^a-z0-9]+", "_", value.lower()).strip("_") or "unknown"
+
+
+def read_manifest(store_path: Path) -> dict:
+    return json.loads((Path(store_path) / SHARD_MANIFEST_FILENAME).read_text(encoding="utf-8"))
+
+
+class ShardedStoreWriter:
+    """Routes documents into one Chroma store per shard under a common root directory."""
+
+    def __init__(self, store_path: Path, embeddings, shard_by: str = "product_category",
+                 only_shards: list[str] | None = None):
+        if shard_by not in SHARD_KEYS:
+            raise ValueError(f"shard_by must be one of {SHARD_KEYS}, got {shard_by!r}")
+        self.store_path = Path(store_path)
+        self.embeddings = embeddings
+        self.shard_by = shard_by
+        # When set, only these shards are (re)built; rows for other shards are skipped
+        self.only_shards = set(only_shards) if only_shards else None
+        self.shards: dict[str, Chroma] = {}
+        self.counts: dict[str, int] = {}
+
+        self.manifest = {"shard_by": shard_by, "shards": {}}
+        # Partial rebuilds extend the existing manifest; check before touching anything on disk
+        if self.only_shards is not None:
+            if not is_sharded(self.store_path):
+                raise ValueError(
+                    f"only_shards needs an existing sharded store at {self.store_path}; build all shards first")
+            existing = read_manifest(self.store_path)
+            if existing.get("shard_by") != shard_by:
+                raise ValueError(
+                    f"Store is sharded by {existing.get('shard_by')!r}, not {shard_by!r}; rebuild all shards")
+            self.manifest = existing
+
+        self.store_path.mkdir(parents=True, exist_ok=True)
+        if not is_sharded(self.store_path) and (self.store_path / "chroma.sqlite3").exists():
+            # Switching an unsharded store to shards: drop the old root index
+            Chroma(
+                persist_directory=str(self.store_path),
+                embedding_function=embeddings,
+                collection_name="complaint_chunks"
+            ).delete_collection()
+            (self.store_path / BUILD_ID_FILENAME).unlink(missing_ok=True)  # Version now lives in shards.json
+
+    def _shard(self, value: str) -> Chroma:
+        if value not in self.shards:
+            shard_path = self.store_path / shard_dirname(value)
+            db = Chroma(
+                persist_directory=str(shard_path),
+                embedding_function=self.embeddings,
+                collection_name="complaint_chunks"
+            )
+            db.delete_collection()  # Start fresh — a shard is always rebuilt as a whole
+            self.shards[value] = Chroma(
+                persist_directory=str(shard_path),
+                embedding_function=self.embeddings,
+                collection_name="complaint_chunks"
+            )
+            self.counts[value] = 0
+        return self.shards[value]
+
+    def add_documents(self, docs: list[Document]) -> int:
+        groups: dict[str, list[Document]] = {}
+        for doc in docs:
+            value = shard_value(doc.metadata, self.shard_by)
+            if self.only_shards is not None and value not in self.only_shards:
+                continue
+            if self.shard_by == "year":
+                doc.metadata["year"] = value
+            groups.setdefault(value, []).append(doc)
+
+        for value, group in groups.items():
+            db = self._shard(value)
+            # Chroma rejects upserts larger than its max batch size (5,461 by default)
+            max_batch = db._client.get_max_batch_size()
+            for start in range(0, len(group), max_batch):
+                db.add_documents(group[start:start + max_batch])
+            self.counts[value] += len(group)
+        return sum(len(g) for g in groups.values())
+
+    def close(self) -> dict:
+        """Record the rebuilt shards in the manifest and return it."""
+        if self.only_shards is not None:
+            empty = sorted(self.only_shards - set(self.counts))
+            if empty:
+                print(f"Warning: no rows for shard(s) {empty}; their previous data was left as is")
+            if not self.counts:
+                return self.manifest  # Nothing rebuilt: same store version
+        for value, count in self.counts.items():
+            self.manifest["shards"][value] = {"path": shard_dirname(value), "chunks": count}
+        # Any (partial) rebuild is a new store version for the warm cache
+        self.manifest["build_id"] = new_build_id()
+        (self.store_path / SHARD_MANIFEST_FILENAME).write_text(
+            json.dumps(self.manifest, indent=2), encoding="utf-8")
+        return self.manifest
+
+
+class ShardedVectorStore:
+    """Read side of a sharded store: routes filtered searches, fans out unfiltered ones."""
+
+    def __init__(self, shards: dict[str, Chroma], shard_by: str, embeddings,
+                 max_workers: int | None = None, available: list[str] | None = None):
+        self.shards = shards
+        self.shard_by = shard_by
+        self.embeddings = embeddings
+        # Every shard in the manifest, including ones not opened
+        self.available = list(available) if available is not None else list(shards)
+        self.max_workers = max_workers or max(1, len(shards))
+
+    @classmethod
+    def load(cls, store_path: Path, embeddings, shards: list[str] | None = None) -> "ShardedVectorStore":
+        """Open all shards, or only the listed shard values to save memory."""
+        manifest = read_manifest(store_path)
+        available = manifest["shards"]
+        selected = shards if shards is not None else list(available)
+        missing = [s for s in selected if s not in available]
+        if missing:
+            raise ValueError(f"Unknown shard(s) {missing}; available: {list(available)}")
+
+        opened = {
+            value: Chroma(
+                persist_directory=str(Path(store_path) / available[value]["path"]),
+                embedding_function=embeddings,
+                collection_name="complaint_chunks"
+            )
+            for value in selected
+        }
+        return cls(opened, manifest["shard_by"], embeddings, available=list(available))
+
+    def count(self) -> int:
+        return sum(db._collection.count() for db in self.shards.values())
+
+    def _route(self, filter: dict | None) -> list[Chroma]:
+        value = (filter or {}).get(self.shard_by)
+        if isinstance(value, str):
+            if value in self.shards:
+                return [self.shards[value]]
+            if value in self.available:
+                raise ValueError(
+                    f"Shard {value!r} exists but was not loaded; opened shards: {list(self.shards)}")
+            print(f"Warning: no shard for {self.shard_by}={value!r}; available: {self.available}")
+            return []
+        return list(self.shards.values())
+
+    def similarity_search_with_score(self, query: str, k: int = 4,
+                                     filter: dict | None = None) -> list[tuple[Document, float]]:
+        targets = self._route(filter)
+        if not targets:
+            return []
+        # Embed once, then search shards in parallel and merge by distance (lower is closer)
+        embedding = self.embeddings.embed_query(query)
+        if len(targets) == 1:
+            results = targets[0].similarity_search_by_vector_with_relevance_scores(embedding, k=k, filter=filter)
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(targets))) as pool:
+                per_shard = pool.map(
+                    lambda db: db.similarity_search_by_vector_with_relevance_scores(embedding, k=k, filter=filter),
+                    targets)
+                results = [hit for hits in per_shard for hit in hits]
+        return sorted(results, key=lambda hit: hit[1])[:k]
+
+    def similarity_search(self, query: str, k: int = 4, filter: dict | None = None) -> list[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k, filter=filter)]
+
+    def as_retriever(self, search_kwargs: dict | None = None) -> "ShardedRetriever":
+        return ShardedRetriever(store=self, search_kwargs=search_kwargs or {})
+
+
+class ShardedRetriever(BaseRetriever):
+    store: ShardedVectorStore
+    search_kwargs: dict
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    def _get_relevant_documents(self, query: str, *,
+                                run_manager: CallbackManagerForRetrieverRun) -> list[Document]:
+        return self.store.similarity_search(query, **self.search_kwargs)
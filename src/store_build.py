@@ -0,0 +1,44 @@
+# src/store_build.py
+import json
+import time
+import uuid
+from pathlib import Path
+
+from .config import BUILD_ID_FILENAME, SHARD_MANIFEST_FILENAME
+
+
+def new_build_id() -> str:
+    return f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+
+def mark_store_built(store_path: Path) -> str:
+    """Record a fresh build ID for a store; builders call this after indexing.
+
+    Sharded stores keep it in shards.json (ShardedStoreWriter.close sets it directly).
+    """
+    store_path = Path(store_path)
+    build_id = new_build_id()
+    manifest = store_path / SHARD_MANIFEST_FILENAME
+    if manifest.exists():
+        data = json.loads(manifest.read_text(encoding="utf-8"))
+        data["build_id"] = build_id
+        manifest.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    else:
+        (store_path / BUILD_ID_FILENAME).write_text(build_id, encoding="utf-8")
+    return build_id
+
+
+def store_version(store_path: Path) -> str | None:
+    """Build ID of a store (shards.json for sharded stores), or None if it predates build IDs.
+
+    Chroma touches its own files on every open and read, so only this
+    build-time marker is a stable version.
+    """
+    store_path = Path(store_path)
+    manifest = store_path / SHARD_MANIFEST_FILENAME
+    if manifest.exists():
+        return json.loads(manifest.read_text(encoding="utf-8")).get("build_id")
+    build_id_file = store_path / BUILD_ID_FILENAME
+    if build_id_file.exists():
+        return build_id_file.read_text(encoding="utf-8").strip() or None
+    return None
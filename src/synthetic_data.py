@@ -0,0 +1,179 @@
+# src/synthetic_data.py
+import random
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterator
+
+import pandas as pd
+from langchain_chroma import Chroma
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models import FakeListChatModel
+
+from .config import PRODUCT_MAPPING
+from .sharding import ShardedStoreWriter, ShardedVectorStore
+from .store_build import mark_store_built
+
+# Same dimensionality as sentence-transformers/all-MiniLM-L6-v2
+EMBEDDING_DIM = 384
+
+# Rough share of each category in the real filtered CFPB data
+CATEGORY_WEIGHTS = {
+    "Credit Cards": 0.40,
+    "Savings Accounts": 0.30,
+    "Money Transfers": 0.18,
+    "Personal Loans": 0.12,
+}
+
+CATEGORY_ISSUES = {
+    "Credit Cards": ["Problem with a purchase shown on your statement", "Fees or interest",
+                     "Incorrect information on your report", "Closing your account"],
+    "Savings Accounts": ["Managing an account", "Problem caused by your funds being low",
+                         "Opening an account", "Closing an account"],
+    "Money Transfers": ["Fraud or scam", "Money was not available when promised",
+                        "Other transaction problem", "Unauthorized transactions or other transaction problem"],
+    "Personal Loans": ["Struggling to pay your loan", "Charged fees or interest you didn't expect",
+                       "Getting a loan", "Problem with the payoff process at the end of the loan"],
+}
+
+COMPANIES = ["Capital One", "JPMorgan Chase", "Bank of America", "Wells Fargo",
+             "Citibank", "Synchrony Financial", "PayPal", "Western Union"]
+STATES = ["CA", "TX", "FL", "NY", "GA", "IL", "PA", "OH", "NC", "MI"]
+
+SENTENCES = [
+    "i was charged a fee that was never explained to me",
+    "the bank did not respond to my dispute for several weeks",
+    "there was an unauthorized transaction on my account",
+    "customer service kept transferring me between departments",
+    "my payment was posted late even though i paid on time",
+    "the transfer was delayed and the recipient never got the money",
+    "they closed my account without any notice",
+    "interest was added after i had already paid the balance",
+    "i reported the fraud immediately but they refused to refund me",
+    "the representative promised a callback that never happened",
+    "my credit report still shows the incorrect information",
+    "i was told the hold would be released within two days",
+]
+
+
+def _category_products() -> dict[str, list[str]]:
+    products: dict[str, list[str]] = {}
+    for product, category in PRODUCT_MAPPING.items():
+        products.setdefault(category, []).append(product)
+    return products
+
+
+def _narrative(rng: random.Random, category: str, min_sentences: int, max_sentences: int) -> str:
+    n = rng.randint(min_sentences, max_sentences)
+    sentences = [f"i have a problem with my {category.lower()[:-1]}"]
+    sentences += [rng.choice(SENTENCES) for _ in range(n)]
+    return ". ".join(sentences) + "."
+
+
+def generate_synthetic_complaints(n_complaints: int, seed: int = 42,
+                                  min_sentences: int = 3, max_sentences: int = 12) -> pd.DataFrame:
+    """Generate a complaint table shaped like FILTERED_CSV (the Task 1 output)."""
+    rng = random.Random(seed)
+    categories = list(CATEGORY_WEIGHTS)
+    weights = list(CATEGORY_WEIGHTS.values())
+    products = _category_products()
+    start = date(2020, 1, 1)
+
+    rows = []
+    for i in range(n_complaints):
+        category = rng.choices(categories, weights=weights)[0]
+        narrative = _narrative(rng, category, min_sentences, max_sentences)
+        rows.append({
+            "Complaint ID": str(1_000_000 + i),
+            "Product": rng.choice(products[category]),
+            "Issue": rng.choice(CATEGORY_ISSUES[category]),
+            "Sub-issue": "",
+            "Company": rng.choice(COMPANIES),
+            "State": rng.choice(STATES),
+            "Date received": (start + timedelta(days=rng.randrange(1800))).isoformat(),
+            "Consumer complaint narrative": narrative,
+            "product_category": category,
+            "clean_narrative": narrative,
+        })
+    return pd.DataFrame(rows)
+
+
+def iter_synthetic_chunks(n_chunks: int, seed: int = 42, batch_size: int = 5000) -> Iterator[list[Document]]:
+    """Yield batches of chunk Documents with the same metadata schema as load_prebuilt.py."""
+    rng = random.Random(seed)
+    categories = list(CATEGORY_WEIGHTS)
+    weights = list(CATEGORY_WEIGHTS.values())
+    products = _category_products()
+    start = date(2020, 1, 1)
+
+    produced = 0
+    complaint_id = 1_000_000
+    while produced < n_chunks:
+        batch = []
+        while len(batch) < batch_size and produced < n_chunks:
+            category = rng.choices(categories, weights=weights)[0]
+            total_chunks = min(rng.randint(1, 4), n_chunks - produced)
+            base_metadata = {
+                "complaint_id": str(complaint_id),
+                "product_category": category,
+                "product": rng.choice(products[category]),
+                "issue": rng.choice(CATEGORY_ISSUES[category]),
+                "sub_issue": "",
+                "company": rng.choice(COMPANIES),
+                "state": rng.choice(STATES),
+                "date_received": (start + timedelta(days=rng.randrange(1800))).isoformat(),
+                "total_chunks": total_chunks,
+            }
+            for idx in range(total_chunks):
+                batch.append(Document(
+                    page_content=_narrative(rng, category, 2, 6),
+                    metadata={**base_metadata, "chunk_index": idx},
+                ))
+            produced += total_chunks
+            complaint_id += 1
+        yield batch
+
+
+def fake_embeddings() -> DeterministicFakeEmbedding:
+    """Offline stand-in for HuggingFaceEmbeddings: the same text always maps to the same vector."""
+    return DeterministicFakeEmbedding(size=EMBEDDING_DIM)
+
+
+def fake_llm(responses: list[str] | None = None) -> FakeListChatModel:
+    """Offline stand-in for ChatOllama that cycles through canned answers."""
+    if responses is None:
+        responses = ["Customers mainly complain about unexpected fees, unauthorized "
+                     "transactions and slow responses to disputes."]
+    return FakeListChatModel(responses=responses)
+
+
+def index_batches(persist_dir: Path, batches, embeddings=None, shard_by: str | None = None):
+    """Index pre-generated chunk batches into a Chroma store (or a sharded store) at persist_dir."""
+    persist_dir = Path(persist_dir)
+    persist_dir.mkdir(parents=True, exist_ok=True)
+    embeddings = embeddings or fake_embeddings()
+
+    if shard_by:
+        writer = ShardedStoreWriter(persist_dir, embeddings, shard_by=shard_by)
+        for batch in batches:
+            writer.add_documents(batch)
+        writer.close()
+        return ShardedVectorStore.load(persist_dir, embeddings)
+
+    db = Chroma(
+        persist_directory=str(persist_dir),
+        embedding_function=embeddings,
+        collection_name="complaint_chunks"
+    )
+    for batch in batches:
+        ids = [f"{d.metadata['complaint_id']}-{d.metadata['chunk_index']}" for d in batch]
+        db.add_documents(batch, ids=ids)
+    mark_store_built(persist_dir)
+    return db
+
+
+def build_synthetic_store(persist_dir: Path, n_chunks: int, embeddings=None,
+                          seed: int = 42, batch_size: int = 5000, shard_by: str | None = None):
+    """Index n_chunks synthetic chunks into a Chroma store (or a sharded store) at persist_dir."""
+    batches = iter_synthetic_chunks(n_chunks, seed=seed, batch_size=batch_size)
+    return index_batches(persist_dir, batches, embeddings=embeddings, shard_by=shard_by)
@@ -5,35 +5,51 @@ from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain_chroma import Chroma
 from langchain_core.documents import Document
 from pathlib import Path
-from .config import FILTERED_CSV, VECTOR_STORE_DIR
+from .config import FILTERED_CSV, VECTOR_STORE_DIR, SHARD_MANIFEST_FILENAME
+from .sampling import StratifiedReservoirSampler, stream_stratified_samples
+from .sharding import ShardedStoreWriter
+from .store_build import mark_store_built
+from .warm_cache import warm_up_after_build
 
 
 class SampleVectorStoreBuilder:
-    def __init__(self, sample_size: int = 12000):
+    def __init__(self, sample_size: int = 12000, shard_by: str | None = None, seed: int = 42,
+                 embeddings=None):
         self.sample_size = sample_size
+        self.seed = seed
+        # "product_category" or "year" → one Chroma store per shard (see src/sharding.py)
+        self.shard_by = shard_by
         self.embedding_model = "sentence-transformers/all-MiniLM-L6-v2"
-        self.embeddings = HuggingFaceEmbeddings(model_name=self.embedding_model)
+        # Tests inject an offline fake (see src/synthetic_data.py)
+        self.embeddings = embeddings or HuggingFaceEmbeddings(model_name=self.embedding_model)
         self.vector_store_path = VECTOR_STORE_DIR / "sample_chroma"
 
-    def load_filtered_data(self) -> pd.DataFrame:
-        print(f"Loading filtered complaints from {FILTERED_CSV}...")
-        df = pd.read_csv(FILTERED_CSV)
-        print(f"Loaded {len(df):,} complaints")
-        return df
-
     def create_stratified_sample(self, df: pd.DataFrame) -> pd.DataFrame:
+        """In-memory variant; picks the same rows as stream_stratified_samples for the same seed."""
         print(f"\nCreating stratified sample of {self.sample_size} complaints...")
         # Stratified sampling proportional to product_category
-        sample_df = df.groupby('product_category', group_keys=False).apply(
-            lambda x: x.sample(frac=self.sample_size / len(df), random_state=42)
-        )
-        if len(sample_df) > self.sample_size:
-            sample_df = sample_df.sample(n=self.sample_size, random_state=42)
-        
+        sampler = StratifiedReservoirSampler(self.sample_size, seed=self.seed)
+        sampler.update(df.reset_index(drop=True))
+        sample_df = df.iloc[sampler.selections()[self.sample_size]]
+
+        self._report_sample(sample_df)
+        return sample_df
+
+    def sample_tiers(self, sizes: list[int] | None = None, sources=FILTERED_CSV) -> dict[int, pd.DataFrame]:
+        """Bounded-memory stratified samples of several sizes in one pass over the processed data."""
+        sizes = sizes or [self.sample_size]
+        print(f"\nStreaming stratified samples of {', '.join(f'{n:,}' for n in sorted(sizes))} complaints "
+              f"from {sources}...")
+        samples = stream_stratified_samples(sources, sizes, seed=self.seed)
+        for sample_df in samples.values():
+            self._report_sample(sample_df)
+        return samples
+
+    @staticmethod
+    def _report_sample(sample_df: pd.DataFrame):
         print(f"Sample created: {len(sample_df)} complaints")
         print("Distribution:")
         print(sample_df['product_category'].value_counts())
-        return sample_df
 
     def chunk_narratives(self, sample_df: pd.DataFrame) -> list[Document]:
         print("\nChunking narratives (chunk_size=500, overlap=50)...")
@@ -68,26 +84,57 @@ class SampleVectorStoreBuilder:
         print(f"Created {len(documents)} chunks from {len(sample_df)} complaints")
         return documents
 
-    def build_and_persist_vector_store(self, documents: list[Document]):
+    def build_and_persist_vector_store(self, documents: list[Document], store_path: Path | None = None):
         print("\nBuilding vector store with ChromaDB (auto-persistence enabled)...")
-        self.vector_store_path.mkdir(parents=True, exist_ok=True)
+        store_path = store_path or self.vector_store_path
+        store_path.mkdir(parents=True, exist_ok=True)
+
+        if self.shard_by:
+            writer = ShardedStoreWriter(store_path, self.embeddings, shard_by=self.shard_by)
+            writer.add_documents(documents)
+            manifest = writer.close()
+            print(f"Sharded by {self.shard_by}: {', '.join(manifest['shards'])}")
+            print(f"Vector store automatically persisted to: {store_path}")
+            return
+
+        # Drop any manifest left by a previous sharded build
+        (store_path / SHARD_MANIFEST_FILENAME).unlink(missing_ok=True)
 
         # No need for db.persist() — it's automatic with persist_directory
         db = Chroma.from_documents(
             documents=documents,
             embedding=self.embeddings,
-            persist_directory=str(self.vector_store_path),
+            persist_directory=str(store_path),
             collection_name="complaint_chunks"
         )
-        print(f"Vector store automatically persisted to: {self.vector_store_path}")
+        mark_store_built(store_path)
+        print(f"Vector store automatically persisted to: {store_path}")
 
-    def run(self):
-        df = self.load_filtered_data()
-        sample_df = self.create_stratified_sample(df)
+    def warm_up(self, store_path: Path | None = None):
+        """Precompute canonical answers for the freshly built store."""
+        warm_up_after_build(store_path or self.vector_store_path)
+
+    def run(self, warm_up: bool = True):
+        # Streams FILTERED_CSV instead of loading it whole
+        sample_df = self.sample_tiers()[self.sample_size]
         documents = self.chunk_narratives(sample_df)
         self.build_and_persist_vector_store(documents)
+        if warm_up:
+            self.warm_up()
         print("\nTask 2 completed successfully!")
 
+    def run_tiered(self, sizes: list[int], warm_up: bool = False) -> dict[int, Path]:
+        """Build one staging store per sample size (sample_chroma_<n>) from a single sampling pass."""
+        store_paths = {}
+        for n, sample_df in self.sample_tiers(sizes).items():
+            store_path = VECTOR_STORE_DIR / f"sample_chroma_{n}"
+            self.build_and_persist_vector_store(self.chunk_narratives(sample_df), store_path)
+            if warm_up:
+                self.warm_up(store_path)
+            store_paths[n] = store_path
+        print(f"\nTiered stores built: {', '.join(str(p) for p in store_paths.values())}")
+        return store_paths
+
 
 if __name__ == "__main__":
     builder = SampleVectorStoreBuilder(sample_size=12000)
@@ -0,0 +1,170 @@
+# src/warm_cache.py
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from .config import (
+    CANONICAL_QUESTION_TEMPLATES, PRODUCT_MAPPING,
+    WARM_CACHE_FILENAME, FULL_PREBUILT_STORE, SAMPLE_VECTOR_STORE
+)
+from .store_build import mark_store_built, store_version
+
+# One background warm-up per store per process, shared by all UI sessions
+_warm_jobs: dict[str, threading.Thread] = {}
+_warm_jobs_lock = threading.Lock()
+
+
+def normalize_question(question: str) -> str:
+    return " ".join(question.lower().split()).rstrip("?").strip()
+
+
+def canonical_questions(templates: list[str] = CANONICAL_QUESTION_TEMPLATES,
+                        categories: list[str] | None = None,
+                        extra: list[str] | None = None) -> list[tuple[str, str | None]]:
+    """(question, product_category) pairs, de-duplicated in order.
+
+    Template questions carry their category so their retrieval is filtered to it;
+    the evaluation set is cross-product and unfiltered (category None).
+    """
+    if categories is None:
+        categories = list(dict.fromkeys(PRODUCT_MAPPING.values()))
+    if extra is None:
+        from .rag_pipeline import EVALUATION_QUESTIONS
+        extra = EVALUATION_QUESTIONS
+
+    questions = [(t.format(category=c), c) for c in categories for t in templates]
+    questions += [(q, None) for q in extra]
+    seen = set()
+    unique = []
+    for q, category in questions:
+        key = normalize_question(q)
+        if key not in seen:
+            seen.add(key)
+            unique.append((q, category))
+    return unique
+
+
+class WarmAnswerCache:
+    """Precomputed (answer, sources) pairs for canonical questions, tied to one store version."""
+
+    def __init__(self, store_path: Path):
+        self.store_path = Path(store_path)
+        self.cache_file = self.store_path / WARM_CACHE_FILENAME
+        self.store_version: str | None = None
+        self.entries: dict[str, dict] = {}
+
+    @classmethod
+    def load(cls, store_path: Path) -> "WarmAnswerCache":
+        cache = cls(store_path)
+        if cache.cache_file.exists():
+            try:
+                data = json.loads(cache.cache_file.read_text(encoding="utf-8"))
+                cache.store_version = data.get("store_version")
+                cache.entries = data.get("entries", {})
+            except (json.JSONDecodeError, OSError) as e:
+                print(f"Ignoring unreadable warm cache {cache.cache_file}: {e}")
+        return cache
+
+    def is_fresh(self) -> bool:
+        return bool(self.entries) and self.store_version is not None \
+            and self.store_version == store_version(self.store_path)
+
+    def get(self, question: str):
+        """Return (answer, sources) for a cached question, or None."""
+        entry = self.entries.get(normalize_question(question))
+        if entry is None:
+            return None
+        return entry["answer"], entry["sources"]
+
+    def save(self):
+        payload = {
+            "store_version": self.store_version,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "entries": self.entries,
+        }
+        # Write-then-rename so a reader never sees a half-written cache;
+        # a unique temp name keeps concurrent writers from clobbering each other
+        fd, tmp_name = tempfile.mkstemp(dir=self.store_path, prefix=".warm_cache.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f, indent=2)
+            os.replace(tmp_name, self.cache_file)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def build(self, rag, questions: list) -> "WarmAnswerCache":
+        """Answer each question (a string, or a (question, product_category) pair) with rag.
+
+        Entries are tagged with the build the rag was opened on, not whatever is
+        on disk now, so answers from an old build are never stamped as fresh.
+        """
+        # Stores built before build IDs existed get one now
+        version = getattr(rag, "store_version", None) \
+            or store_version(self.store_path) or mark_store_built(self.store_path)
+        entries = {}
+        for i, item in enumerate(questions, 1):
+            q, category = (item, None) if isinstance(item, str) else item
+            print(f"Warming question {i}/{len(questions)}: {q}")
+            if category is None:
+                answer, sources = rag.ask(q)
+            else:
+                answer, sources = rag.ask(q, product_category=category)
+            entries[normalize_question(q)] = {
+                "question": q, "product_category": category, "answer": answer, "sources": sources
+            }
+
+        self.store_version = version
+        self.entries = entries
+        self.save()
+        print(f"Warm cache saved: {len(entries)} answers → {self.cache_file}")
+        return self
+
+
+def warm_store(store_path: Path, questions: list[str] | None = None, rag=None) -> WarmAnswerCache:
+    """Precompute and persist answers for the canonical questions of one store."""
+    if rag is None:
+        from .rag_pipeline import CrediTrustRAG
+        rag = CrediTrustRAG(store_path=store_path)
+    return WarmAnswerCache(store_path).build(rag, questions or canonical_questions())
+
+
+def warm_up_after_build(store_path: Path):
+    """Builders' post-build hook: warm the new store, but never fail the build (needs Ollama running)."""
+    try:
+        warm_store(store_path)
+    except Exception as e:
+        print(f"Warm-up skipped: {e}")
+
+
+def _warm_quietly(store_path: Path, rag, questions: list[str] | None):
+    try:
+        warm_store(store_path, questions=questions, rag=rag)
+    except Exception as e:
+        print(f"Background warm-up failed: {e}")
+
+
+def warm_store_in_background(store_path: Path, rag=None, questions: list[str] | None = None) -> threading.Thread:
+    """Start a warm-up thread for store_path unless one is already running in this process."""
+    key = str(Path(store_path).resolve())
+    with _warm_jobs_lock:
+        job = _warm_jobs.get(key)
+        if job is None or not job.is_alive():
+            job = threading.Thread(target=_warm_quietly, args=(store_path, rag, questions), daemon=True)
+            job.start()
+            _warm_jobs[key] = job
+    return job
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute answers for canonical questions")
+    parser.add_argument("--store", type=Path, default=None,
+                        help="Vector store directory (default: full store, else sample store)")
+    args = parser.parse_args()
+
+    store = args.store or (FULL_PREBUILT_STORE if FULL_PREBUILT_STORE.exists() else SAMPLE_VECTOR_STORE)
+    warm_store(store)
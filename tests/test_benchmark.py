@@ -0,0 +1,53 @@
+# tests/test_benchmark.py
+import pytest
+from src.benchmark import benchmark_store, format_results, percentile, run_benchmarks
+from src.synthetic_data import CATEGORY_WEIGHTS, generate_synthetic_complaints, iter_synthetic_chunks
+
+
+def test_synthetic_complaints_are_deterministic():
+    """Same seed → identical corpus; columns match the Task 1 output"""
+    first = generate_synthetic_complaints(200, seed=7)
+    second = generate_synthetic_complaints(200, seed=7)
+    assert first.equals(second)
+    assert len(first) == 200
+    assert {"Complaint ID", "Product", "product_category", "clean_narrative"} <= set(first.columns)
+    assert set(first["product_category"]) <= set(CATEGORY_WEIGHTS)
+
+
+def test_synthetic_chunks_exact_count():
+    """Chunk generator yields exactly n_chunks across batches"""
+    batches = list(iter_synthetic_chunks(1234, batch_size=500))
+    assert sum(len(b) for b in batches) == 1234
+    assert all(len(b) <= 503 for b in batches)  # a complaint's chunks stay in one batch
+
+
+def test_percentile():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    # Nearest rank rounds up, never to even
+    assert percentile([1.0, 2.0, 3.0, 4.0, 5.0], 50) == 3.0
+    assert percentile([1.0, 2.0, 3.0], 99) == 3.0
+
+
+def test_benchmark_store_small(tmp_path):
+    """Tiny end-to-end benchmark run — catches regressions without network or GPU"""
+    result = benchmark_store(1000, tmp_path, n_queries=20, batch_size=250)
+    assert result["chunks"] == 1000
+    assert result["ingest_rows_per_sec"] > 0
+    assert 0 < result["query_p50_ms"] <= result["query_p99_ms"]
+    assert result["peak_rss_mb"] > 0
+    assert 0 <= result["rss_delta_mb"] <= result["peak_rss_mb"]
+    assert "| 1,000 |" in format_results([result])
+
+
+def test_run_benchmarks_uses_subprocess_per_size():
+    results = run_benchmarks([300, 200], n_queries=5)
+    assert [r["chunks"] for r in results] == [200, 300]
+
+
+@pytest.mark.slow
+def test_benchmark_sweep():
+    """Full 10k → 1M sweep; run manually with `pytest -m slow`"""
+    results = run_benchmarks()
+    assert [r["chunks"] for r in results] == [10_000, 100_000, 1_000_000]
@@ -1,27 +1,33 @@
 # tests/test_rag_pipeline.py
 import pytest
-from pathlib import Path
 from src.rag_pipeline import CrediTrustRAG
+from src.synthetic_data import build_synthetic_store, fake_embeddings, fake_llm
 from langchain_core.documents import Document
 
 # ---------------------------------------------------------------------------
 # Fixtures / Helpers
 # ---------------------------------------------------------------------------
 
+FAKE_ANSWER = "Customers report unexpected fees and unauthorized credit card charges."
+
 
 @pytest.fixture(scope="module")
-def rag_system():
-    """Create RAG instance once per module (expensive to load every time)"""
-    # Use sample store for faster tests
-    # If you want full store tests → change to full_prebuilt and increase timeouts
-    rag = CrediTrustRAG(top_k=3)
-    # Override to sample store for speed in CI/tests
-    rag.db = rag.db.__class__(
-        persist_directory=str(Path("vector_store") / "sample_chroma"),
-        embedding_function=rag.embeddings,
-        collection_name="complaint_chunks"
+def synthetic_store(tmp_path_factory):
+    """Small synthetic store so tests never touch the real data or network"""
+    store_path = tmp_path_factory.mktemp("synthetic_chroma")
+    build_synthetic_store(store_path, n_chunks=500, embeddings=fake_embeddings())
+    return store_path
+
+
+@pytest.fixture(scope="module")
+def rag_system(synthetic_store):
+    """Create RAG instance once per module with offline embedder and LLM"""
+    return CrediTrustRAG(
+        top_k=3,
+        store_path=synthetic_store,
+        embeddings=fake_embeddings(),
+        llm=fake_llm([FAKE_ANSWER]),
     )
-    return rag
 
 
 @pytest.fixture
@@ -50,24 +56,37 @@ def test_rag_initialization(rag_system):
     assert rag_system.retriever is not None
     assert rag_system.llm is not None
     assert rag_system.prompt is not None
+    assert rag_system.db._collection.count() == 500
+
+
+def test_missing_store_raises(tmp_path):
+    """An explicit store path that does not exist should fail loudly"""
+    with pytest.raises(FileNotFoundError):
+        CrediTrustRAG(store_path=tmp_path / "missing",
+                      embeddings=fake_embeddings(), llm=fake_llm())
 
 
 def test_retriever_returns_docs(rag_system):
     """Basic retriever smoke test"""
     docs = rag_system.retriever.invoke("credit card problems")
     assert isinstance(docs, list)
-    assert len(docs) <= rag_system.top_k
-    if len(docs) > 0:
-        assert hasattr(docs[0], "page_content")
-        assert hasattr(docs[0], "metadata")
+    assert 0 < len(docs) <= rag_system.top_k
+    assert hasattr(docs[0], "page_content")
+    assert hasattr(docs[0], "metadata")
+
+
+def test_retriever_is_deterministic(rag_system):
+    """Fake embedder must give identical results for identical queries"""
+    first = rag_system.retriever.invoke("unauthorized charges")
+    second = rag_system.retriever.invoke("unauthorized charges")
+    assert [d.page_content for d in first] == [d.page_content for d in second]
 
 
 def test_ask_returns_tuple(rag_system):
     """ask() should return (str, list)"""
     answer, sources = rag_system.ask(
         "Why are customers unhappy with Credit Cards?")
-    assert isinstance(answer, str)
-    assert len(answer) > 10, "Answer seems too short"
+    assert answer == FAKE_ANSWER
     assert isinstance(sources, list)
     assert all(isinstance(s, dict) for s in sources)
     assert all("product_category" in s for s in sources)
@@ -88,12 +107,3 @@ def test_format_docs(rag_system, sample_docs):
     assert "[2]" in formatted
     assert "Personal Loan" in formatted
     assert "Credit Card" in formatted
-
-
-@pytest.mark.slow
-def test_end_to_end_ask(rag_system):
-    """End-to-end test — can be slow because it actually calls LLM"""
-    answer, sources = rag_system.ask("billing dispute credit card")
-    assert isinstance(answer, str)
-    assert len(answer) > 20
-    assert any("Credit Card" in s["product_category"] for s in sources)
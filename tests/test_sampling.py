@@ -0,0 +1,99 @@
+# tests/test_sampling.py
+import pytest
+from src.sampling import StratifiedReservoirSampler, allocate, stream_stratified_samples
+from src.synthetic_data import generate_synthetic_complaints
+
+
+@pytest.fixture(scope="module")
+def complaints():
+    return generate_synthetic_complaints(5000, seed=11, min_sentences=1, max_sentences=3)
+
+
+@pytest.fixture(scope="module")
+def csv_path(complaints, tmp_path_factory):
+    path = tmp_path_factory.mktemp("processed") / "filtered_complaints.csv"
+    complaints.to_csv(path, index=False)
+    return path
+
+
+def test_allocate_is_proportional_and_exact():
+    counts = {"Credit Cards": 400, "Savings Accounts": 300, "Money Transfers": 180, "Personal Loans": 120}
+    alloc = allocate(counts, 101)
+    assert sum(alloc.values()) == 101
+    assert all(abs(alloc[k] - 101 * c / 1000) < 1 for k, c in counts.items())
+    assert allocate(counts, 5000) == counts
+
+
+def test_stream_keeps_product_proportions(complaints, csv_path):
+    samples = stream_stratified_samples(csv_path, [1000], chunksize=700)
+    sample = samples[1000]
+    assert len(sample) == 1000
+    assert sample["Complaint ID"].is_unique
+    expected = complaints["product_category"].value_counts(normalize=True)
+    observed = sample["product_category"].value_counts(normalize=True)
+    for category, share in expected.items():
+        assert observed[category] == pytest.approx(share, abs=0.002)
+    # Narratives are materialized for selected rows
+    assert sample["clean_narrative"].str.len().gt(0).all()
+
+
+def test_deterministic_per_seed_and_chunk_size(csv_path):
+    a = stream_stratified_samples(csv_path, 500, seed=1, chunksize=333)[500]
+    b = stream_stratified_samples(csv_path, 500, seed=1, chunksize=5000)[500]
+    c = stream_stratified_samples(csv_path, 500, seed=2)[500]
+    assert a.equals(b)
+    assert set(a["Complaint ID"]) != set(c["Complaint ID"])
+
+
+def test_multiple_sizes_in_one_pass_are_nested(csv_path):
+    samples = stream_stratified_samples(csv_path, [200, 1000, 3000], chunksize=1000)
+    assert {n: len(df) for n, df in samples.items()} == {200: 200, 1000: 1000, 3000: 3000}
+    ids = {n: set(df["Complaint ID"]) for n, df in samples.items()}
+    assert ids[200] <= ids[1000] <= ids[3000]
+
+
+def test_partitions_and_in_memory_match_single_file(complaints, csv_path, tmp_path):
+    """Same seed → same rows whether data is one CSV, parquet partitions, or a DataFrame"""
+    pytest.importorskip("pyarrow")
+    parts = []
+    for i, start in enumerate(range(0, len(complaints), 2000)):
+        path = tmp_path / f"part-{i}.parquet"
+        complaints.iloc[start:start + 2000].to_parquet(path, index=False)
+        parts.append(path)
+
+    from_csv = stream_stratified_samples(csv_path, 700)[700]
+    from_parts = stream_stratified_samples(parts, 700)[700]
+    assert list(from_parts["Complaint ID"]) == list(from_csv["Complaint ID"])
+
+    sampler = StratifiedReservoirSampler(700)
+    sampler.update(complaints)
+    in_memory = complaints.iloc[sampler.selections()[700]]
+    assert list(in_memory["Complaint ID"]) == list(from_csv["Complaint ID"])
+
+
+def test_memory_is_bounded_by_largest_size(complaints):
+    sampler = StratifiedReservoirSampler([50, 100])
+    for start in range(0, len(complaints), 500):
+        sampler.update(complaints.iloc[start:start + 500].reset_index(drop=True))
+    assert sampler.rows_seen == len(complaints)
+    assert all(len(p) <= 100 for p in sampler._positions.values())
+
+
+def test_stream_reads_sources_once_with_bounded_rows(csv_path, monkeypatch):
+    import src.sampling as sampling
+    reads = []
+    real_iter = sampling.iter_data_chunks
+
+    def counting_iter(*args, **kwargs):
+        reads.append(args)
+        return real_iter(*args, **kwargs)
+
+    monkeypatch.setattr(sampling, "iter_data_chunks", counting_iter)
+    sampler = StratifiedReservoirSampler([100, 300], keep_rows=True)
+    for chunk in sampling.iter_data_chunks(csv_path, chunksize=400):
+        sampler.update(chunk)
+        assert all(len(rows) <= 300 for rows in sampler._rows.values())
+    streamed = stream_stratified_samples(csv_path, [100, 300], chunksize=400)
+
+    assert len(reads) == 2  # one for the manual loop above, one for stream_stratified_samples
+    assert all(sampler.samples()[n].equals(streamed[n]) for n in (100, 300))
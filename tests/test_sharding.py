@@ -0,0 +1,129 @@
+# tests/test_sharding.py
+import chromadb
+import pytest
+from src.rag_pipeline import CrediTrustRAG
+from src.vector_store_builder import SampleVectorStoreBuilder
+from src.sharding import ShardedStoreWriter, ShardedVectorStore, is_sharded, read_manifest, shard_dirname
+from src.synthetic_data import CATEGORY_WEIGHTS, build_synthetic_store, fake_embeddings, fake_llm, iter_synthetic_chunks
+
+
+@pytest.fixture(scope="module")
+def sharded_store(tmp_path_factory):
+    store_path = tmp_path_factory.mktemp("sharded")
+    build_synthetic_store(store_path, n_chunks=600, shard_by="product_category")
+    return store_path
+
+
+def test_manifest_lists_one_shard_per_category(sharded_store):
+    assert is_sharded(sharded_store)
+    manifest = read_manifest(sharded_store)
+    assert manifest["shard_by"] == "product_category"
+    assert set(manifest["shards"]) == set(CATEGORY_WEIGHTS)
+    assert sum(s["chunks"] for s in manifest["shards"].values()) == 600
+    assert (sharded_store / shard_dirname("Credit Cards")).is_dir()
+
+
+def test_filtered_query_routes_to_one_shard(sharded_store):
+    store = ShardedVectorStore.load(sharded_store, fake_embeddings())
+    docs = store.similarity_search("fees", k=5, filter={"product_category": "Money Transfers"})
+    assert len(docs) == 5
+    assert all(d.metadata["product_category"] == "Money Transfers" for d in docs)
+    assert store.similarity_search("fees", k=5, filter={"product_category": "Mortgages"}) == []
+
+
+def test_fan_out_matches_single_store(sharded_store, tmp_path):
+    """Merged top-k across shards equals top-k of the same data in one collection"""
+    single = build_synthetic_store(tmp_path / "single", n_chunks=600)
+    sharded = ShardedVectorStore.load(sharded_store, fake_embeddings())
+    query = "unauthorized transaction on my account"
+    expected = [d.page_content for d, _ in single.similarity_search_with_score(query, k=8)]
+    merged = sharded.similarity_search_with_score(query, k=8)
+    assert [d.page_content for d, _ in merged] == expected
+    assert [s for _, s in merged] == sorted(s for _, s in merged)
+
+
+def test_load_subset_of_shards(sharded_store):
+    store = ShardedVectorStore.load(sharded_store, fake_embeddings(), shards=["Credit Cards"])
+    assert list(store.shards) == ["Credit Cards"]
+    with pytest.raises(ValueError):
+        ShardedVectorStore.load(sharded_store, fake_embeddings(), shards=["Mortgages"])
+
+
+def test_rebuild_single_shard_keeps_others(tmp_path):
+    build_synthetic_store(tmp_path, n_chunks=300, shard_by="product_category")
+    before = read_manifest(tmp_path)["shards"]
+
+    writer = ShardedStoreWriter(tmp_path, fake_embeddings(), only_shards=["Credit Cards"])
+    for batch in iter_synthetic_chunks(100, seed=3):
+        writer.add_documents(batch)
+    after = writer.close()["shards"]
+
+    assert set(after) == set(before)
+    assert after["Savings Accounts"] == before["Savings Accounts"]
+    store = ShardedVectorStore.load(tmp_path, fake_embeddings(), shards=["Credit Cards"])
+    assert store.count() == after["Credit Cards"]["chunks"] < 100
+
+
+def test_rag_on_sharded_store(sharded_store):
+    rag = CrediTrustRAG(top_k=3, store_path=sharded_store,
+                        embeddings=fake_embeddings(), llm=fake_llm(["sharded answer"]))
+    assert rag.db.count() == 600
+    answer, sources = rag.ask("Why are fees so high?", product_category="Personal Loans")
+    assert answer == "sharded answer"
+    assert len(sources) == 3
+    assert {s["product_category"] for s in sources} == {"Personal Loans"}
+    assert len(rag.retriever.invoke("Why are fees so high?")) == 3
+
+
+def test_unloaded_shard_filter_raises(sharded_store):
+    rag = CrediTrustRAG(top_k=3, store_path=sharded_store, shards=["Credit Cards"],
+                        embeddings=fake_embeddings(), llm=fake_llm())
+    assert len(rag.retrieve("fees", product_category="Credit Cards")) == 3
+    with pytest.raises(ValueError, match="not loaded"):
+        rag.ask("fees", product_category="Money Transfers")
+
+
+def test_sharded_builder_batches_large_shards(tmp_path):
+    """One shard above Chroma's 5,461 max batch must still index in one call"""
+    docs = [d for batch in iter_synthetic_chunks(14_000) for d in batch]
+    builder = SampleVectorStoreBuilder(shard_by="product_category", embeddings=fake_embeddings())
+    builder.build_and_persist_vector_store(docs, store_path=tmp_path)
+
+    manifest = read_manifest(tmp_path)
+    assert manifest["shards"]["Credit Cards"]["chunks"] > 5461
+    assert ShardedVectorStore.load(tmp_path, fake_embeddings()).count() == 14_000
+
+
+def test_switching_to_sharded_drops_root_collection(tmp_path):
+    build_synthetic_store(tmp_path, n_chunks=300)
+    assert [c.name for c in chromadb.PersistentClient(path=str(tmp_path)).list_collections()] == ["complaint_chunks"]
+
+    build_synthetic_store(tmp_path, n_chunks=300, shard_by="product_category")
+    assert chromadb.PersistentClient(path=str(tmp_path)).list_collections() == []
+    assert not (tmp_path / "build_id").exists()
+    assert read_manifest(tmp_path)["build_id"]
+
+
+def test_partial_rebuild_needs_matching_sharded_store(tmp_path):
+    build_synthetic_store(tmp_path, n_chunks=300)
+    with pytest.raises(ValueError, match="existing sharded store"):
+        ShardedStoreWriter(tmp_path, fake_embeddings(), only_shards=["Credit Cards"])
+    # The unsharded index is untouched
+    assert [c.name for c in chromadb.PersistentClient(path=str(tmp_path)).list_collections()] == ["complaint_chunks"]
+
+    build_synthetic_store(tmp_path / "by_year", n_chunks=300, shard_by="year")
+    with pytest.raises(ValueError, match="sharded by 'year'"):
+        ShardedStoreWriter(tmp_path / "by_year", fake_embeddings(), only_shards=["Credit Cards"])
+
+
+def test_partial_rebuild_of_empty_shard_warns_and_keeps_version(tmp_path, capsys):
+    build_synthetic_store(tmp_path, n_chunks=300, shard_by="product_category")
+    before = read_manifest(tmp_path)
+
+    writer = ShardedStoreWriter(tmp_path, fake_embeddings(), only_shards=["Mortgages"])
+    for batch in iter_synthetic_chunks(100, seed=3):
+        writer.add_documents(batch)
+    writer.close()
+
+    assert "no rows for shard(s) ['Mortgages']" in capsys.readouterr().out
+    assert read_manifest(tmp_path) == before
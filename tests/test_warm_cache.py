@@ -0,0 +1,157 @@
+# tests/test_warm_cache.py
+import subprocess
+import sys
+import threading
+import pytest
+from pathlib import Path
+from src.rag_pipeline import CrediTrustRAG, EVALUATION_QUESTIONS
+from src.synthetic_data import build_synthetic_store, fake_embeddings, fake_llm
+from src.warm_cache import (
+    WarmAnswerCache, canonical_questions, normalize_question, store_version, warm_store,
+    warm_store_in_background
+)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+@pytest.fixture
+def store_and_rag(tmp_path):
+    store_path = tmp_path / "store"
+    build_synthetic_store(store_path, n_chunks=200)
+    rag = CrediTrustRAG(top_k=3, store_path=store_path,
+                        embeddings=fake_embeddings(), llm=fake_llm(["warm answer"]))
+    return store_path, rag
+
+
+def test_canonical_questions_cover_categories_and_evaluation_set():
+    pairs = canonical_questions(templates=["Why are customers unhappy with {category}?"])
+    for category in ["Credit Cards", "Personal Loans", "Savings Accounts", "Money Transfers"]:
+        assert (f"Why are customers unhappy with {category}?", category) in pairs
+    questions = [q for q, _ in pairs]
+    assert set(EVALUATION_QUESTIONS) <= set(questions)
+    # "Why are customers unhappy with Credit Cards?" appears in both sources only once
+    assert len(questions) == len({q.lower() for q in questions})
+
+
+def test_warm_store_round_trip(store_and_rag):
+    """Answers persist with the store and are served by normalized question text"""
+    store_path, rag = store_and_rag
+    warm_store(store_path, questions=["Are there delays in Money Transfers?"], rag=rag)
+
+    cache = WarmAnswerCache.load(store_path)
+    assert cache.is_fresh()
+    answer, sources = cache.get("  are there delays in money transfers ")
+    assert answer == "warm answer"
+    assert 0 < len(sources) <= 3
+    assert cache.get("Something never warmed?") is None
+
+
+def test_cache_goes_stale_when_store_changes(store_and_rag):
+    store_path, rag = store_and_rag
+    version = store_version(store_path)
+    warm_store(store_path, questions=["Why are customers unhappy with Credit Cards?"], rag=rag)
+    # Writing the cache file itself must not change the store version
+    assert store_version(store_path) == version
+
+    build_synthetic_store(store_path, n_chunks=400, seed=1)
+    assert not WarmAnswerCache.load(store_path).is_fresh()
+
+
+def test_template_questions_retrieve_within_their_category(store_and_rag):
+    store_path, rag = store_and_rag
+    warm_store(store_path, questions=canonical_questions(templates=["What fees annoy {category} customers?"],
+                                                         extra=[]), rag=rag)
+
+    cache = WarmAnswerCache.load(store_path)
+    for category in ["Credit Cards", "Personal Loans", "Savings Accounts", "Money Transfers"]:
+        entry = cache.entries[normalize_question(f"What fees annoy {category} customers?")]
+        assert entry["product_category"] == category
+        assert entry["sources"]
+        assert {s["product_category"] for s in entry["sources"]} == {category}
+
+
+def test_rag_from_old_build_does_not_refresh_cache(store_and_rag):
+    """A RAG opened before a rebuild tags its answers with its own build, so they stay stale"""
+    store_path, rag = store_and_rag
+    old_version = rag.store_version
+    build_synthetic_store(store_path, n_chunks=400, seed=1)
+    assert store_version(store_path) != old_version
+
+    cache = warm_store(store_path, questions=["Are there delays in Money Transfers?"], rag=rag)
+    assert cache.store_version == old_version
+    assert not WarmAnswerCache.load(store_path).is_fresh()
+
+
+def test_missing_or_corrupt_cache_is_empty(tmp_path):
+    assert not WarmAnswerCache.load(tmp_path).is_fresh()
+    (tmp_path / "warm_cache.json").write_text("{not json")
+    cache = WarmAnswerCache.load(tmp_path)
+    assert cache.entries == {}
+    assert cache.get("anything") is None
+
+
+def test_cache_stays_fresh_after_reopening_store(store_and_rag):
+    """Opening and querying the store in a new process must not invalidate the cache"""
+    store_path, rag = store_and_rag
+    warm_store(store_path, questions=["Are there delays in Money Transfers?"], rag=rag)
+
+    script = (
+        "from src.rag_pipeline import CrediTrustRAG\n"
+        "from src.synthetic_data import fake_embeddings, fake_llm\n"
+        f"rag = CrediTrustRAG(store_path={str(store_path)!r}, embeddings=fake_embeddings(), llm=fake_llm())\n"
+        "rag.ask('Why are customers unhappy with Credit Cards?')\n"
+    )
+    subprocess.run([sys.executable, "-c", script], cwd=PROJECT_ROOT, check=True, capture_output=True)
+    assert WarmAnswerCache.load(store_path).is_fresh()
+
+
+def test_store_without_build_id_gets_one_on_warm_up(store_and_rag):
+    store_path, _ = store_and_rag
+    (store_path / "build_id").unlink()
+    assert store_version(store_path) is None
+    rag = CrediTrustRAG(top_k=3, store_path=store_path,
+                        embeddings=fake_embeddings(), llm=fake_llm(["warm answer"]))
+    assert rag.store_version is None
+    warm_store(store_path, questions=["Are there delays in Money Transfers?"], rag=rag)
+    assert store_version(store_path) is not None
+    assert WarmAnswerCache.load(store_path).is_fresh()
+
+
+def test_concurrent_saves_do_not_collide(tmp_path):
+    cache = WarmAnswerCache(tmp_path)
+    cache.store_version = "v1"
+    cache.entries = {"q": {"question": "q", "answer": "a", "sources": []}}
+    errors = []
+
+    def save_many():
+        try:
+            for _ in range(20):
+                cache.save()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=save_many) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert WarmAnswerCache.load(tmp_path).get("q") == ("a", [])
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_one_background_job_per_store(store_and_rag):
+    store_path, _ = store_and_rag
+    release = threading.Event()
+
+    class SlowRag:
+        def ask(self, question):
+            release.wait(5)
+            return "slow answer", []
+
+    first = warm_store_in_background(store_path, rag=SlowRag(), questions=["q1"])
+    second = warm_store_in_background(store_path, rag=SlowRag(), questions=["q1"])
+    assert first is second
+    release.set()
+    first.join(5)
+    assert WarmAnswerCache.load(store_path).get("q1") == ("slow answer", [])